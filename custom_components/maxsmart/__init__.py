@@ -7,6 +7,7 @@ from homeassistant.core import HomeAssistant
 import logging
 
 from .const import DOMAIN
+from .coordinator import MaxSmartCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -17,11 +18,20 @@ PLATFORMS: list[Platform] = [Platform.SWITCH, Platform.SENSOR]
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Max Hauri MaxSmart Power Devices from a config entry."""
-    _LOGGER.info("async_setup_entry from __init__.py")
+    _LOGGER.debug("async_setup_entry from __init__.py")
+
+    # One coordinator per device, shared by the switch and sensor platforms
+    coordinator = MaxSmartCoordinator(hass, entry)
+    await coordinator.async_config_entry_first_refresh()
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        hass.data[DOMAIN].pop(entry.entry_id)
+    return unload_ok
@@ -1,5 +1,6 @@
+import asyncio
 import logging
-from homeassistant import config_entries, exceptions
+from homeassistant import config_entries
 from homeassistant.const import CONF_IP_ADDRESS
 import voluptuous as vol
 from .const import DOMAIN
@@ -7,11 +8,17 @@ from maxsmart import MaxSmartDiscovery, MaxSmartDevice
 
 _LOGGER = logging.getLogger(__name__)
 
+# Port names used when the firmware does not report them
+_DEFAULT_PORT_NAMES = tuple(f"Port {i}" for i in range(1, 7))
+# Seconds allowed for the port check; the library retries and sets no HTTP timeout
+PORT_CHECK_TIMEOUT = 10
+
 async def async_get_number_of_ports(hass, ip_address):
     """Get the number of ports for the device with the given IP address."""
     _LOGGER.debug("Checking number of ports")
     device = MaxSmartDevice(ip_address)
-    state = await hass.async_add_executor_job(device.check_state)
+    async with asyncio.timeout(PORT_CHECK_TIMEOUT):
+        state = await hass.async_add_executor_job(device.check_state)
     # Logic to determine the number of ports from the state
     # (replace with the appropriate logic for your use case)
     return len(state)
@@ -24,29 +31,30 @@ class MaxSmartConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     async def async_step_user(self, user_input=None):
         """Handle a flow initialized by the user."""
-        errors = {}
-
         if user_input is None:
             _LOGGER.info("Starting user-initiated device discovery without IP.")
             devices = await self.hass.async_add_executor_job(
                 MaxSmartDiscovery.discover_maxsmart
             )
-            _LOGGER.info(f"Discovered devices without IP: {devices}")
+            _LOGGER.info("Discovered devices without IP: %s", devices)
         else:
             _LOGGER.info("Starting user-initiated device discovery with IP.")
             devices = await self.hass.async_add_executor_job(
                 MaxSmartDiscovery.discover_maxsmart, user_input[CONF_IP_ADDRESS]
             )
-            _LOGGER.info(f"Discovered devices with IP: {devices}")
+            _LOGGER.info("Discovered devices with IP: %s", devices)
 
         if devices:
             _LOGGER.info("Devices have been found. Attempting to create entries")
-            for device in devices:
-                await self.hass.config_entries.flow.async_init(
+            # Each device has its own unique_id, so the imports are independent
+            await asyncio.gather(*(
+                self.hass.config_entries.flow.async_init(
                     DOMAIN,
                     context={"source": config_entries.SOURCE_IMPORT},
                     data=device
                 )
+                for device in devices
+            ))
             return self.async_abort(reason="devices_found")
         else:
             return self.async_show_form(
@@ -55,13 +63,19 @@ class MaxSmartConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors={"base": "no_devices_found"},
             )
 
-    _LOGGER.info("Finished step user")
-
     async def async_step_import(self, device):
         """Create entry for a device"""
         ip_address = device["ip"]
         device_name = device["name"]
-        num_of_ports = await async_get_number_of_ports(self.hass, ip_address)
+        try:
+            num_of_ports = await async_get_number_of_ports(self.hass, ip_address)
+        except TimeoutError:
+            _LOGGER.error("Timed out checking the ports of device %s", ip_address)
+            return self.async_abort(reason="cannot_connect")
+        except Exception as err:
+            # The library raises bare Exception when the device refuses or never answers
+            _LOGGER.error("Failed to check the ports of device %s: %s", ip_address, err)
+            return self.async_abort(reason="cannot_connect")
         firmware = device["ver"]
 
         try:
@@ -83,12 +97,12 @@ class MaxSmartConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             elif num_of_ports == 6:
                 if firmware != "1.30":
                     device_name = ip_address
-                    pname = ["Port 1", "Port 2", "Port 3", "Port 4", "Port 5", "Port 6"]
+                    pname = _DEFAULT_PORT_NAMES
                 port_data = {
                     "master": {"port_id": 0, "port_name": "Master"},
                     "individual_ports": [
-                        {"port_id": i + 1, "port_name": f"{i + 1}. {port_name}"}
-                        for i, port_name in enumerate(pname)
+                        {"port_id": i, "port_name": f"{i}. {port_name}"}
+                        for i, port_name in enumerate(pname, start=1)
                     ],
                 }
 
@@ -118,6 +132,7 @@ class MaxSmartConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 data=device_data,
             )
 
-        except Exception as err:
+        except (KeyError, TypeError) as err:
             _LOGGER.error("Failed to create device entry: %s", err)
+            return self.async_abort(reason="invalid_device_data")
 
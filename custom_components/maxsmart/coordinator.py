@@ -1,17 +1,167 @@
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from dataclasses import dataclass, replace
 from datetime import timedelta
 from maxsmart import MaxSmartDevice
+from .const import DOMAIN
+import asyncio
 import logging
 
 _LOGGER = logging.getLogger(__name__)
 
+UPDATE_INTERVAL = timedelta(seconds=5)
+MAX_UPDATE_INTERVAL = timedelta(seconds=60)
+MAX_IDLE_UPDATE_INTERVAL = timedelta(seconds=30)
+# The library sets no HTTP timeout. Like the config flow's port check, leave
+# room for its three attempts, each followed by a 1s sleep
+UPDATE_TIMEOUT = 10
+# turn_on/turn_off send the command and then read the port state back
+COMMAND_TIMEOUT = 10
+# Seconds after which a timed-out call, e.g. caught by a power cycle, is left
+# to its thread so the device can be reached again; at most a few per device
+ABANDON_TIMEOUT = 60
+MAX_ABANDONED_CALLS = 3
+
+
+@dataclass(slots=True, frozen=True)
+class MaxSmartData:
+    """Switch states and raw watt readings of a device, one item per port."""
+
+    switch: tuple[int, ...]
+    watt: tuple[float, ...]
+
+
 class MaxSmartCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass, device_ip):
-        self._maxsmart_device = MaxSmartDevice(device_ip)
-        super().__init__(hass, _LOGGER, name="MaxSmart", update_interval=timedelta(seconds=5))
+    # DataUpdateCoordinator keeps its own __dict__; slot the attributes added here
+    __slots__ = ("device", "device_info", "_port_count", "_fail_streak", "_idle_streak", "_lock", "_inflight", "_inflight_since", "_abandoned")
+
+    def __init__(self, hass, entry):
+        device_data = entry.data
+        self.device = MaxSmartDevice(device_data['device_ip'])
+        self._port_count = len(device_data['ports']['individual_ports'])
+        device_model = 'MaxSmart Smart Plug' if self._port_count == 1 else 'MaxSmart Power Station'
+        # Shared by every entity of this device
+        self.device_info = {
+            "identifiers": {
+                # Serial numbers are unique identifiers within a specific domain
+                (DOMAIN, device_data['device_unique_id'])
+            },
+            "name": f"Maxsmart {device_data['device_name']}",
+            "manufacturer": "Max Hauri",
+            "model": device_model,
+            "sw_version": device_data['sw_version'],
+        }
+        self._fail_streak = 0
+        self._idle_streak = 0
+        # The device handles one request at a time; keep polls and commands apart
+        self._lock = asyncio.Lock()
+        # Executor future of the last library call, kept until its thread returns
+        self._inflight = None
+        self._inflight_since = 0.0
+        # Abandoned calls whose threads have not returned yet
+        self._abandoned = 0
+        # Only notify entities when the switch or watt readings actually change
+        super().__init__(hass, _LOGGER, name="MaxSmart", update_interval=UPDATE_INTERVAL, always_update=False)
 
     async def _async_update_data(self):
-        _LOGGER.debug("Starting data update")
-        data = await self.hass.async_add_executor_job(self._maxsmart_device.get_data)
-        _LOGGER.debug("Data retrieved: %s", data)
-        return data
\ No newline at end of file
+        # Take the lock before the timeout starts: waiting for a command is not a device failure
+        async with self._lock:
+            if self._device_busy():
+                self._back_off()
+                raise UpdateFailed("Device has not answered a previous request yet")
+            try:
+                raw = await self._async_run(UPDATE_TIMEOUT, self.device.get_data)
+                data = MaxSmartData(tuple(raw["switch"]), tuple(float(watt) for watt in raw["watt"]))
+                # The library returns empty lists when the response has no data
+                if len(data.switch) != self._port_count or len(data.watt) != self._port_count:
+                    raise ValueError(f"Expected {self._port_count} ports, got {data}")
+            except TimeoutError as err:
+                self._back_off()
+                raise UpdateFailed(f"Timed out after {UPDATE_TIMEOUT}s polling device") from err
+            except Exception as err:
+                self._back_off()
+                # HA prefixes "Error fetching MaxSmart data:"; str(err) only runs if it is logged
+                raise UpdateFailed(err) from err
+
+        # Poll an idle device less often: 10s, 20s, then every 30s until something
+        # changes. Recovering from a failure counts as a change.
+        if data == self.data and not self._fail_streak:
+            self._idle_streak += 1
+        else:
+            self._idle_streak = 0
+        self._fail_streak = 0
+        self.update_interval = min(UPDATE_INTERVAL * 2 ** min(self._idle_streak, 3), MAX_IDLE_UPDATE_INTERVAL)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Data retrieved: %s", data)
+        return data
+
+    def _device_busy(self):
+        """Whether a library call that timed out is still running in its thread.
+
+        A call still running after ABANDON_TIMEOUT is given up on, so one stuck
+        request does not keep the device unavailable until a reload. Only
+        MAX_ABANDONED_CALLS threads per device are left behind this way.
+        """
+        if self._inflight is None or self._inflight.done():
+            return False
+        if (
+            self.hass.loop.time() - self._inflight_since < ABANDON_TIMEOUT
+            or self._abandoned >= MAX_ABANDONED_CALLS
+        ):
+            return True
+        _LOGGER.warning("Giving up on a request to %s that has not returned", self.device.ip)
+        self._abandoned += 1
+        self._inflight.add_done_callback(self._release_abandoned)
+        self._inflight = None
+        return False
+
+    def _release_abandoned(self, _job):
+        """Count an abandoned call out once its thread finally returns."""
+        self._abandoned -= 1
+
+    async def _async_run(self, timeout, method, *args):
+        """Run a blocking library call in the executor; the lock must be held.
+
+        The library sets no HTTP timeout, so a timed-out call keeps its thread.
+        Only the wait is cancelled: _inflight tracks the call until it returns, and
+        callers must not start another one while _device_busy() is true.
+        """
+        self._inflight = self.hass.async_add_executor_job(method, *args)
+        self._inflight_since = self.hass.loop.time()
+        async with asyncio.timeout(timeout):
+            return await asyncio.shield(self._inflight)
+
+    def _back_off(self):
+        """Poll an unreachable device less often: 10s, 20s, 40s, then every 60s."""
+        self._fail_streak += 1
+        self.update_interval = min(UPDATE_INTERVAL * 2 ** min(self._fail_streak, 4), MAX_UPDATE_INTERVAL)
+
+    async def async_set_port_state(self, port_id, state):
+        """Switch a port (0 for all ports) and push the new state to entities."""
+        method = self.device.turn_on if state else self.device.turn_off
+        # turn_on/turn_off read the port state back and raise if it did not change
+        async with self._lock:
+            if self._device_busy():
+                raise HomeAssistantError("Device has not answered a previous request yet")
+            try:
+                await self._async_run(COMMAND_TIMEOUT, method, port_id)
+            except TimeoutError as err:
+                # A hung command would otherwise hold the lock and stall every poll
+                raise HomeAssistantError(f"Timed out after {COMMAND_TIMEOUT}s switching port {port_id}") from err
+            except Exception as err:
+                # The library raises bare Exception when retries run out or the state check fails
+                raise HomeAssistantError(f"Failed to switch port {port_id}: {err}") from err
+
+        switch_list = list(self.data.switch)
+        if port_id == 0:
+            switch_list = [int(state)] * len(switch_list)
+        else:
+            switch_list[port_id - 1] = int(state)
+        switch = tuple(switch_list)
+        # Entities already show this state, e.g. turning on a port that is on
+        if switch == self.data.switch:
+            return
+        # Back to fast polling so the power readings catch up with the change
+        self._idle_streak = 0
+        self.update_interval = UPDATE_INTERVAL
+        self.async_set_updated_data(replace(self.data, switch=switch))
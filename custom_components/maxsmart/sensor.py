@@ -1,11 +1,9 @@
 """Platform for sensor integration."""
 import logging
-from datetime import timedelta
 from homeassistant.components.sensor import SensorDeviceClass
-from homeassistant.helpers.entity import Entity
-from homeassistant.helpers.dispatcher import async_dispatcher_connect, async_dispatcher_send
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from .const import DOMAIN
-from .coordinator import MaxSmartCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -14,96 +12,51 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
 
     device_data = config_entry.data
     device_unique_id = device_data['device_unique_id']
-    device_ip = device_data['device_ip']
     device_name = device_data['device_name']
     device_ports = device_data['ports']
     device_version = device_data['sw_version']
-    device_model = 'Maxsmart Smart Plug' if len(device_ports['individual_ports']) == 1 else 'Maxsmart Power Station'
 
-    coordinator = MaxSmartCoordinator(hass, device_ip)
-
-    # Start the coordinator
-    await coordinator.async_refresh()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
 
     # Create entities
     master_port = device_ports['master']
-    master_power_sensor_entity = HaMaxSmartPowerSensor(coordinator, device_unique_id, device_name, 0, master_port['port_name'], device_version, device_model)
+    master_power_sensor_entity = HaMaxSmartPowerSensor(coordinator, device_unique_id, device_name, 0, master_port['port_name'], device_version)
 
     power_sensor_entities = [
-        HaMaxSmartPowerSensor(coordinator, device_unique_id, device_name, port['port_id'], port['port_name'], device_version, device_model)
+        HaMaxSmartPowerSensor(coordinator, device_unique_id, device_name, port['port_id'], port['port_name'], device_version)
         for port in device_ports['individual_ports']
     ]
 
     # Add all power sensor entities
     async_add_entities([master_power_sensor_entity] + power_sensor_entities)
 
-class HaMaxSmartPowerSensor(Entity):
-    def __init__(self, coordinator, device_unique_id, device_name, port_id, port_name, device_version, device_model):
-        self._coordinator = coordinator
-        self._device_unique_id = device_unique_id
-        self._device_name = device_name
+class HaMaxSmartPowerSensor(CoordinatorEntity):
+    def __init__(self, coordinator, device_unique_id, device_name, port_id, port_name, device_version):
+        super().__init__(coordinator)
         self._port_id = port_id
-        self._port_unique_id = f"{device_unique_id}_{port_id}"
-        self._port_name = f"{device_name} {port_name}"
-        self._device_version = device_version
-        self._device_model = device_model
+        self._attr_name = f"{device_name} {port_name} Power"
+        self._attr_unique_id = f"{device_unique_id}_{port_id}_power"
         self._power_data = None
-        self._attr_device_info = self.device_info
-        self._attr_unique_id = self.unique_id
-        if self._port_id == 0:
-            self._update_signal = f"maxsmart_update_{self._device_unique_id}"
+        # Firmware 1.30 reports watts, other versions report milliwatts
+        self._watt_divisor = 1.0 if device_version == "1.30" else 1000.0
+        self._attr_device_info = coordinator.device_info
+        self._update_state()
 
-    async def async_added_to_hass(self):
-        """Call when entity is added to hass."""
-        if self._port_id == 0:
-            self.async_on_remove(
-                async_dispatcher_connect(
-                    self.hass, self._update_signal, self.async_update
-                )
-            )
+    @callback
+    def _handle_coordinator_update(self):
+        """Handle updated data from the coordinator."""
+        self._update_state()
+        super()._handle_coordinator_update()
 
-    @property
-    def device_info(self):
-        """Return the device info."""
-        return {
-            "identifiers": {
-                # Serial numbers are unique identifiers within a specific domain
-                (DOMAIN, self._device_unique_id)
-            },
-            "name": f"Maxsmart {self._device_name}",
-            "manufacturer": "Max Hauri",
-            "model": self._device_model,
-            "sw_version": self._device_version,
-        }
-   
-    @property
-    def name(self):
-        return f"{self._port_name} Power"
-
-    @property
-    def unique_id(self):
-        return f"{self._device_unique_id}_{self._port_id}_power"
-
-
-    async def async_update(self, now=None):
-        await self._coordinator.async_refresh()
-        coordinator_data = self._coordinator.data
-        watt_list = coordinator_data['watt']
+    def _update_state(self):
+        watt_list = self.coordinator.data.watt
 
         if self._port_id == 0:  # Master port
-            self._power_data = sum(float(watt) for watt in watt_list)
+            self._power_data = sum(watt_list)
         else:
-            async_dispatcher_send(self.hass, f"maxsmart_update_{self._device_unique_id}")
-            power_data = watt_list[self._port_id - 1]
-            self._power_data = float(power_data)
+            self._power_data = watt_list[self._port_id - 1]
 
-
-        if self._power_data is not None:
-            # Check if the device version is 1.30 and convert from milliwatts to watts if true
-            if self._device_version != "1.30":
-                self._power_data /= 1000.0
-        else:
-            self._power_data = 0
+        self._power_data /= self._watt_divisor
 
     @property
     def unit_of_measurement(self):